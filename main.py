@@ -1,7 +1,10 @@
 import os
+import copy
 import pwd
 import json
+import math
 import psutil
+import socket
 import logging
 from datetime import datetime, timedelta
 from utils import (
@@ -12,7 +15,12 @@ from utils import (
     configure_logging,
     getAbsPath,
     execute_command,
+    run_command,
+    compute_power_status,
+    CommandHealth,
 )
+from statusSnapshot import write_snapshot
+from telemetry import TelemetrySpool
 
 
 def replace_placeholders(command):
@@ -20,9 +28,65 @@ def replace_placeholders(command):
     return command.replace("$$$", getAbsPath("")).replace("~", home_directory)
 
 
-def execute_commands(commands):
+def execute_commands(commands, command_health):
+    results = []
     for command, timeout in commands:
-        execute_command(command, timeout)
+        current_time = datetime.now()
+        quarantine_end = command_health.get_quarantine_end(command, current_time)
+        if quarantine_end:
+            logging.info(
+                f"Skipping quarantined command until {quarantine_end:%Y-%m-%d %H:%M}: {command}"
+            )
+            results.append({"command": command, "quarantined": True})
+            continue
+        _, error, runtime = run_command(command, timeout)
+        command_health.record_run(command, error, runtime, current_time)
+        results.append(
+            {
+                "command": command,
+                "quarantined": False,
+                "error": error,
+                "runtime": runtime,
+            }
+        )
+    return results
+
+
+def publish_status(history):
+    try:
+        status = compute_power_status(history)
+        write_snapshot(status)
+        return status
+    except (OSError, ValueError, ZeroDivisionError) as e:
+        logging.warning(f"Failed to publish status snapshot: {e}")
+        return None
+
+
+def finite_or_none(status):
+    """JSON has no Infinity, so report e.g. an unbounded hours_remaining as null"""
+    if status is None:
+        return None
+    return {
+        key: None if isinstance(value, float) and not math.isfinite(value) else value
+        for key, value in status.items()
+    }
+
+
+def export_telemetry(config, tick):
+    telemetry_config = config.get("telemetry", {})
+    if not telemetry_config.get("enabled"):
+        return
+    endpoint = telemetry_config.get("endpoint")
+    if not endpoint:
+        logging.warning("Telemetry is enabled but no endpoint is configured")
+        return
+    try:
+        spool = TelemetrySpool(getAbsPath("telemetry_spool"))
+        spool.append(tick)
+        # The mode can lag just after unplugging, so gate uploads on the AC line
+        spool.ship(endpoint, is_on_ac=BatteryStatus.get_ac_status() == "1")
+    except (OSError, ValueError) as e:
+        logging.warning(f"Failed to export telemetry: {e}")
 
 
 def should_execute(execution_state, current_execution_mode, config):
@@ -52,18 +116,21 @@ def should_execute(execution_state, current_execution_mode, config):
             f"Last executed {time_elapsed.total_seconds() / 3600:.2f} hours ago. "
             f"Not executing due to insufficient time elapsed."
         )
-        return False, current_time, time_elapsed
+        return False, current_time, time_elapsed, "insufficient_time_elapsed"
 
     if system_rebooted:
         logging.info("System reboot detected. Executing...")
+        reason = "system_rebooted"
     elif mode_changed:
         logging.info("Execution mode has changed. Executing...")
+        reason = "mode_changed"
     else:
         logging.info(
             f"Sufficient time ({time_elapsed.total_seconds() / 3600:.2f} hours) has elapsed. Executing..."
         )
+        reason = "time_elapsed"
 
-    return True, current_time, time_elapsed
+    return True, current_time, time_elapsed, reason
 
 
 def check_screen_lock_status(regular_user, dbus_address):
@@ -154,12 +221,15 @@ def main():
 
     state_manager = StateManager(getAbsPath("execution_state.json"))
     execution_state = state_manager.read_state()
+    initial_state = copy.deepcopy(execution_state)
+    command_health = CommandHealth(execution_state)
 
     battery = BatteryStatus()
     history = ChargeHistory(getAbsPath("charge_history.log"))
 
     history.add_entry(battery.get_charge())
     history.save()
+    power_status = publish_status(history)
 
     charge_direction = history.get_charge_direction()
     is_on_battery = (
@@ -173,13 +243,15 @@ def main():
     one_time_commands = mode_config["commands"]["oneTime"]
     current_execution_mode = "onBattery" if is_on_battery else "onAC"
 
-    execute_one_time, current_time, time_elapsed = should_execute(
+    execute_one_time, current_time, time_elapsed, reason = should_execute(
         execution_state, current_execution_mode, config
     )
 
+    command_results = []
     if execute_one_time:
-        execute_commands(
-            [[replace_placeholders(cmd[0]), cmd[1]] for cmd in one_time_commands]
+        command_results += execute_commands(
+            [[replace_placeholders(cmd[0]), cmd[1]] for cmd in one_time_commands],
+            command_health,
         )
 
         execution_state.update(
@@ -188,7 +260,6 @@ def main():
                 "last_execution_time": current_time.isoformat(),
             }
         )
-        state_manager.write_state(execution_state)
         logging.info(
             f"Executed ALL commands in {'battery' if is_on_battery else 'AC'} mode"
         )
@@ -197,11 +268,35 @@ def main():
             f"Executed recurring commands in {'battery' if is_on_battery else 'AC'} mode"
         )
 
-    if is_screen_on_and_unlocked():
-        execute_commands(
-            [[replace_placeholders(cmd[0]), cmd[1]] for cmd in recurring_commands]
+    screen_active = is_screen_on_and_unlocked()
+    if screen_active:
+        command_results += execute_commands(
+            [[replace_placeholders(cmd[0]), cmd[1]] for cmd in recurring_commands],
+            command_health,
         )
 
+    # Persist the execution mode and command health from this run
+    if execution_state != initial_state:
+        state_manager.write_state(execution_state)
+
+    export_telemetry(
+        config,
+        {
+            "host": socket.gethostname(),
+            "timestamp": current_time.isoformat(),
+            "mode": current_execution_mode,
+            "charge_direction": charge_direction,
+            "power": finite_or_none(power_status),
+            "decision": {
+                "execute_one_time": execute_one_time,
+                "reason": reason,
+                "hours_since_last_execution": time_elapsed.total_seconds() / 3600,
+                "screen_active": screen_active,
+            },
+            "commands": command_results,
+        },
+    )
+
 
 if __name__ == "__main__":
     if os.geteuid() != 0:
@@ -0,0 +1,33 @@
+import os
+from datetime import datetime
+from utils import CommandHealth, StateManager, getAbsPath
+
+
+def main():
+    state_file = getAbsPath("execution_state.json")
+    # read_state() creates a default state file, which a report should not do
+    if not os.path.exists(state_file):
+        print("No quarantined commands.")
+        return
+
+    state_manager = StateManager(state_file)
+    command_health = CommandHealth(state_manager.read_state())
+
+    quarantined = command_health.get_quarantined(datetime.now())
+    if not quarantined:
+        print("No quarantined commands.")
+        return
+
+    for command, record in quarantined.items():
+        quarantined_until = datetime.fromisoformat(record["quarantined_until"])
+        print(command)
+        print(
+            f"  quarantined until {quarantined_until:%Y-%m-%d %H:%M} | "
+            f"{record['failures']} consecutive failures | "
+            f"avg runtime {record['avg_runtime']:.1f}s"
+        )
+        print(f"  last error: {record['last_error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import time
+
+# Kept free of heavy imports: printPowerConsumption.py loads this on every panel poll.
+# /run is tmpfs and only root can create entries in it, unlike /dev/shm.
+SNAPSHOT_FILE = "/run/batteryOptimise/status"
+PANEL_FILE = "/run/batteryOptimise/panel"
+# Assumes main.py is scheduled every minute; this tolerates one missed run.
+# Raise it if the timer runs less often, or every poll falls back to sysfs.
+SNAPSHOT_MAX_AGE_SECONDS = 120
+SNAPSHOT_FIELDS = ("battery_pct", "now_power", "avg_power", "hours_remaining")
+
+
+def format_status(status):
+    return (
+        f"| {status['battery_pct']}% | NOW: {status['now_power']}W || "
+        f"AVG: {status['avg_power']}W | {status['hours_remaining']}H |"
+    )
+
+
+def write_atomic(file_path, text):
+    import tempfile
+
+    file_dir = os.path.dirname(file_path)
+    os.makedirs(file_dir, mode=0o755, exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(dir=file_dir, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        f.write(text)
+    os.chmod(tmp_file, 0o644)
+    os.replace(tmp_file, file_path)
+
+
+def write_snapshot(status, snapshot_file=SNAPSHOT_FILE, panel_file=PANEL_FILE):
+    """
+    Atomically publish a power status snapshot to tmpfs-backed files: the raw
+    values for printPowerConsumption.py, and the formatted line for panels that
+    read the file directly instead of starting Python on every poll.
+    """
+    values = [time.time()] + [status[field] for field in SNAPSHOT_FIELDS]
+    write_atomic(snapshot_file, ",".join(str(value) for value in values) + "\n")
+    write_atomic(panel_file, format_status(status) + "\n")
+
+
+def read_snapshot(snapshot_file=SNAPSHOT_FILE, max_age=SNAPSHOT_MAX_AGE_SECONDS):
+    """
+    Return the published status snapshot, or None if it is missing or stale.
+    """
+    try:
+        with open(snapshot_file, "r") as f:
+            ts_str, *value_strs = f.read().strip().split(",")
+        ts = float(ts_str)
+        values = [float(value) for value in value_strs]
+    except (OSError, ValueError):
+        return None
+    if len(values) != len(SNAPSHOT_FIELDS) or not 0 <= time.time() - ts <= max_age:
+        return None
+    snapshot = dict(zip(SNAPSHOT_FIELDS, values))
+    snapshot["battery_pct"] = int(snapshot["battery_pct"])
+    return snapshot
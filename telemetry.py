@@ -0,0 +1,163 @@
+import os
+import glob
+import gzip
+import json
+import time
+import socket
+import logging
+import http.client
+import urllib.parse
+
+TELEMETRY_BATCH_MAX_BYTES = 64 * 1024  # uncompressed ticks per sealed batch
+TELEMETRY_SPOOL_FULL_BYTES = 768 * 1024  # ship even on battery past this
+TELEMETRY_SPOOL_MAX_BYTES = 1024 * 1024  # drop oldest batches past this
+TELEMETRY_BATCH_MAX_AGE_SECONDS = 60 * 60  # seal a partial batch on AC past this
+TELEMETRY_SHIP_TIMEOUT_SECONDS = 5
+RETRYABLE_CLIENT_ERRORS = (408, 429)
+
+
+class TelemetryRejected(Exception):
+    """The collector refused a batch for good, so retrying it cannot succeed"""
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def post_batch(endpoint, batch_id, payload, timeout=TELEMETRY_SHIP_TIMEOUT_SECONDS):
+    """
+    POST a gzipped batch to an http(s):// or unix:// collector endpoint.
+    """
+    url = urllib.parse.urlsplit(endpoint)
+    if url.scheme == "unix":
+        connection = UnixHTTPConnection(url.path, timeout)
+        request_path = "/ingest"
+    elif url.scheme == "http":
+        connection = http.client.HTTPConnection(url.netloc, timeout=timeout)
+        request_path = url.path or "/ingest"
+    elif url.scheme == "https":
+        connection = http.client.HTTPSConnection(url.netloc, timeout=timeout)
+        request_path = url.path or "/ingest"
+    else:
+        raise ValueError(f"Unsupported telemetry endpoint: {endpoint}")
+
+    try:
+        connection.request(
+            "POST",
+            request_path,
+            body=payload,
+            headers={
+                "Content-Type": "application/x-ndjson",
+                "Content-Encoding": "gzip",
+                "X-Batch-Id": batch_id,
+            },
+        )
+        response = connection.getresponse()
+        response.read()
+    finally:
+        connection.close()
+
+    if 400 <= response.status < 500 and response.status not in RETRYABLE_CLIENT_ERRORS:
+        raise TelemetryRejected(f"Collector rejected batch with HTTP {response.status}")
+    if not 200 <= response.status < 300:
+        raise OSError(f"Collector returned HTTP {response.status}")
+
+
+class TelemetrySpool:
+    def __init__(self, spool_dir):
+        self.spool_dir = spool_dir
+        os.makedirs(spool_dir, exist_ok=True)
+
+    def get_open_batch(self):
+        """Return (path, opened_ns) of the batch still being appended to"""
+        open_batches = sorted(glob.glob(os.path.join(self.spool_dir, "open-*.jsonl")))
+        if not open_batches:
+            return None, None
+        opened_ns = os.path.basename(open_batches[0])[len("open-") : -len(".jsonl")]
+        return open_batches[0], int(opened_ns)
+
+    def append(self, record):
+        open_file, _ = self.get_open_batch()
+        if open_file is None:
+            open_file = os.path.join(self.spool_dir, f"open-{time.time_ns()}.jsonl")
+        with open(open_file, "a") as f:
+            f.write(json.dumps(record, allow_nan=False) + "\n")
+        if os.path.getsize(open_file) >= TELEMETRY_BATCH_MAX_BYTES:
+            self.seal()
+
+    def seal(self):
+        """Compress the open batch into an immutable, uniquely named batch file"""
+        open_file, opened_ns = self.get_open_batch()
+        if open_file is None:
+            return
+        with open(open_file, "rb") as f:
+            data = f.read()
+        if data:
+            # The batch id doubles as the collector's dedup key on retries
+            batch_id = f"{socket.gethostname()}-{opened_ns}"
+            batch_file = os.path.join(self.spool_dir, f"batch-{batch_id}.jsonl.gz")
+            with open(f"{batch_file}.tmp", "wb") as f:
+                f.write(gzip.compress(data))
+            os.replace(f"{batch_file}.tmp", batch_file)
+        os.remove(open_file)
+        self.enforce_size_limit()
+
+    def get_batches(self):
+        # Batch ids embed a nanosecond timestamp, so name order is age order
+        return sorted(glob.glob(os.path.join(self.spool_dir, "batch-*.jsonl.gz")))
+
+    def get_size(self):
+        return sum(os.path.getsize(batch_file) for batch_file in self.get_batches())
+
+    def enforce_size_limit(self):
+        batches = self.get_batches()
+        total_size = sum(os.path.getsize(batch_file) for batch_file in batches)
+        while batches and total_size > TELEMETRY_SPOOL_MAX_BYTES:
+            oldest = batches.pop(0)
+            total_size -= os.path.getsize(oldest)
+            os.remove(oldest)
+            logging.warning(f"Telemetry spool full, dropped {oldest}")
+
+    def ship(self, endpoint, is_on_ac):
+        """
+        Upload sealed batches when on AC or when the spool is nearly full.
+        On AC the open batch is only sealed once it is old enough, so ticks
+        are still shipped in batches rather than one POST per run.
+        Batches that fail temporarily stay in the spool and are retried on a
+        later tick; batches the collector rejects are dropped.
+        """
+        if is_on_ac:
+            _, opened_ns = self.get_open_batch()
+            age_seconds = (time.time_ns() - opened_ns) / 1e9 if opened_ns else 0
+            if age_seconds >= TELEMETRY_BATCH_MAX_AGE_SECONDS:
+                self.seal()
+        elif self.get_size() < TELEMETRY_SPOOL_FULL_BYTES:
+            return 0
+
+        shipped = 0
+        for batch_file in self.get_batches():
+            batch_id = os.path.basename(batch_file)[len("batch-") : -len(".jsonl.gz")]
+            with open(batch_file, "rb") as f:
+                payload = f.read()
+            try:
+                post_batch(endpoint, batch_id, payload)
+            except TelemetryRejected as e:
+                logging.warning(f"Dropping telemetry batch {batch_id}: {e}")
+                os.remove(batch_file)
+                continue
+            except (OSError, ValueError, http.client.HTTPException) as e:
+                logging.warning(f"Telemetry upload failed, will retry later: {e}")
+                break
+            os.remove(batch_file)
+            shipped += 1
+
+        if shipped:
+            logging.info(f"Shipped {shipped} telemetry batches to {endpoint}")
+        return shipped
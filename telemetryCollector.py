@@ -0,0 +1,215 @@
+import os
+import re
+import sys
+import glob
+import gzip
+import json
+import zlib
+import socketserver
+import urllib.parse
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BATCH_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]+$")
+
+
+def is_json(line):
+    try:
+        json.loads(line)
+    except ValueError:
+        return False
+    return True
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    store_dir = None
+
+    def do_POST(self):
+        batch_id = self.headers.get("X-Batch-Id", "")
+        if not BATCH_ID_PATTERN.match(batch_id):
+            self.send_error(400, "Missing or invalid X-Batch-Id")
+            return
+
+        try:
+            content_length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            content_length = 0
+        payload = self.rfile.read(content_length) if content_length > 0 else b""
+        try:
+            lines = gzip.decompress(payload).decode().splitlines()
+        except (OSError, EOFError, zlib.error, UnicodeDecodeError):
+            self.send_error(400, "Batch is not valid gzip")
+            return
+        # An empty batch would claim its id and turn the real upload into a duplicate
+        if not any(is_json(line) for line in lines):
+            self.send_error(400, "Batch contains no JSON lines")
+            return
+
+        # Retried uploads reuse their batch id, so an existing file means a duplicate
+        batch_file = os.path.join(self.store_dir, f"{batch_id}.jsonl.gz")
+        if os.path.exists(batch_file):
+            status = "duplicate"
+        else:
+            with open(f"{batch_file}.tmp", "wb") as f:
+                f.write(payload)
+            os.replace(f"{batch_file}.tmp", batch_file)
+            status = "stored"
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.end_headers()
+        self.wfile.write(status.encode())
+
+    def log_message(self, format, *args):
+        # Unix socket clients have no address, so skip address_string()
+        sys.stderr.write(f"{self.log_date_time_string()} {format % args}\n")
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(listen, store_dir):
+    """
+    Accept batches on http://host:port or unix:///path/to.sock.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    CollectorHandler.store_dir = store_dir
+
+    url = urllib.parse.urlsplit(listen)
+    if url.scheme == "unix":
+        if os.path.exists(url.path):
+            os.remove(url.path)
+        server = UnixHTTPServer(url.path, CollectorHandler)
+    elif url.scheme == "http":
+        server = ThreadingHTTPServer((url.hostname, url.port), CollectorHandler)
+    else:
+        raise ValueError(f"Unsupported listen address: {listen}")
+
+    print(f"Collecting telemetry on {listen} into {store_dir}")
+    with server:
+        server.serve_forever()
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_valid_tick(tick):
+    """Check a tick has the fields aggregate() reads, so stray JSON can't crash it"""
+    if not isinstance(tick, dict):
+        return False
+    if not isinstance(tick.get("decision"), dict) or "reason" not in tick["decision"]:
+        return False
+    power = tick.get("power")
+    if power is not None and not isinstance(power, dict):
+        return False
+    commands = tick.get("commands", [])
+    if not isinstance(commands, list):
+        return False
+    for result in commands:
+        if not isinstance(result, dict) or not isinstance(result.get("command"), str):
+            return False
+        if not result.get("quarantined") and not is_number(result.get("runtime")):
+            return False
+    return True
+
+
+def load_ticks(store_dir):
+    for batch_file in sorted(glob.glob(os.path.join(store_dir, "*.jsonl.gz"))):
+        with gzip.open(batch_file, "rt") as f:
+            for line in f:
+                try:
+                    tick = json.loads(line)
+                except ValueError:
+                    continue
+                if is_valid_tick(tick):
+                    yield tick
+
+
+def aggregate(ticks):
+    hosts = defaultdict(
+        lambda: {"ticks": 0, "modes": defaultdict(int), "avg_power": defaultdict(list)}
+    )
+    decisions = defaultdict(int)
+    commands = defaultdict(
+        lambda: {"runs": 0, "failures": 0, "quarantined": 0, "runtime": 0.0}
+    )
+    seen = set()
+
+    for tick in ticks:
+        key = (tick.get("host"), tick.get("timestamp"))
+        if key in seen:
+            continue
+        seen.add(key)
+
+        host = hosts[tick.get("host")]
+        host["ticks"] += 1
+        host["modes"][tick.get("mode")] += 1
+        avg_power = (tick.get("power") or {}).get("avg_power")
+        if is_number(avg_power):
+            host["avg_power"][tick.get("mode")].append(avg_power)
+        decisions[tick["decision"]["reason"]] += 1
+
+        for result in tick.get("commands", []):
+            command = commands[result["command"]]
+            if result.get("quarantined"):
+                command["quarantined"] += 1
+                continue
+            command["runs"] += 1
+            command["runtime"] += result["runtime"]
+            if result.get("error"):
+                command["failures"] += 1
+
+    return hosts, decisions, commands
+
+
+def report(store_dir):
+    hosts, decisions, commands = aggregate(load_ticks(store_dir))
+    if not hosts:
+        print(f"No telemetry found in {store_dir}")
+        return
+
+    print("Hosts:")
+    for name, host in sorted(hosts.items()):
+        modes = ", ".join(
+            f"{mode} {count / host['ticks']:.0%}"
+            for mode, count in sorted(host["modes"].items())
+        )
+        powers = ", ".join(
+            f"{mode} {sum(values) / len(values):.1f}W"
+            for mode, values in sorted(host["avg_power"].items())
+        )
+        print(f"  {name}: {host['ticks']} ticks | {modes} | avg power {powers}")
+
+    print("Decisions:")
+    for reason, count in sorted(decisions.items(), key=lambda item: -item[1]):
+        print(f"  {reason}: {count}")
+
+    print("Commands:")
+    for command, stats in sorted(
+        commands.items(), key=lambda item: -item[1]["failures"]
+    ):
+        avg_runtime = stats["runtime"] / stats["runs"] if stats["runs"] else 0.0
+        print(
+            f"  {stats['failures']}/{stats['runs']} failed | "
+            f"{stats['quarantined']} quarantined skips | "
+            f"avg {avg_runtime:.2f}s | {command}"
+        )
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "serve":
+        serve(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) == 3 and sys.argv[1] == "report":
+        report(sys.argv[2])
+    else:
+        print(
+            "Usage: telemetryCollector.py serve <http://host:port|unix:///path> <dir>"
+        )
+        print("       telemetryCollector.py report <dir>")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
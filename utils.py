@@ -11,6 +11,9 @@ from os import path
 from logging.handlers import TimedRotatingFileHandler
 
 HISTORY_DURATION_MINUTES = 10
+QUARANTINE_FAILURE_THRESHOLD = 3
+QUARANTINE_BASE_HOURS = 1
+QUARANTINE_MAX_HOURS = 7 * 24
 
 
 # File Operations
@@ -28,8 +31,11 @@ def getAbsPath(relPath):
 
 
 # Command Execution
-def execute_command(command, timeout=2):
+def run_command(command, timeout=2):
+    """Run a command and return (output, error, runtime); error is None on success"""
     timeout = int(timeout)
+    error = None
+    start_time = time.monotonic()
     try:
         logging.info(f"Executing command: {command}")
         result = subprocess.run(
@@ -40,16 +46,23 @@ def execute_command(command, timeout=2):
         )
         output = result.stdout.strip()
         if result.returncode != 0:
-            logging.error(
-                f"Command failed with status {result.returncode}: {result.stderr}"
-            )
+            error = f"Command failed with status {result.returncode}: {result.stderr}"
+            logging.error(error)
     except subprocess.TimeoutExpired as e:
-        logging.warning(f"Command timed out after {timeout} seconds")
+        error = f"Command timed out after {timeout} seconds"
+        logging.warning(error)
         output = e.stdout if e.stdout else ""
     except Exception as e:
-        logging.error(f"Command execution error: {type(e).__name__}")
+        error = f"Command execution error: {type(e).__name__}"
+        logging.error(error)
         output = ""
-    return output if isinstance(output, str) else ""
+    runtime = time.monotonic() - start_time
+    return (output if isinstance(output, str) else ""), error, runtime
+
+
+def execute_command(command, timeout=2):
+    output, _, _ = run_command(command, timeout)
+    return output
 
 
 # Battery Status Functions
@@ -193,6 +206,38 @@ class ChargeHistory:
         return instant_power, avg_power
 
 
+def compute_power_status(history):
+    """Summarise battery percentage, power draw and hours remaining"""
+    voltage = BatteryStatus.get_voltage()
+    current_charge = history.entries[-1][1]
+    charge_full = BatteryStatus.get_full_capacity()
+    end_threshold = BatteryStatus.get_end_threshold()
+
+    total_capacity = (end_threshold * charge_full) / 100.0
+
+    now_power, avg_power = history.calculate_power_metrics(voltage)
+
+    if avg_power != 0 and voltage != 0:
+        avg_current_ua = (avg_power / voltage) * 1e6
+        if avg_power > 0:
+            hours_remaining = (total_capacity - current_charge) / abs(avg_current_ua)
+        else:
+            hours_remaining = current_charge / abs(avg_current_ua)
+    else:
+        hours_remaining = float("inf")
+
+    hours_remaining_rounded = abs(round(hours_remaining, 1))
+    if hours_remaining_rounded > 40:
+        hours_remaining_rounded = float("inf")
+
+    return {
+        "battery_pct": BatteryStatus.get_percentage(),
+        "now_power": round(now_power, 1),
+        "avg_power": round(avg_power, 1),
+        "hours_remaining": hours_remaining_rounded,
+    }
+
+
 # System User Functions
 class SystemUser:
     @staticmethod
@@ -270,5 +315,65 @@ class StateManager:
             return json.load(f)
 
     def write_state(self, state):
-        with open(self.state_file, "w") as f:
+        # Write then rename so a kill mid-write cannot leave truncated JSON behind
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w") as f:
             json.dump(state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.state_file)
+
+
+# Command Health Tracking
+class CommandHealth:
+    def __init__(self, execution_state):
+        self.records = execution_state.setdefault("command_health", {})
+
+    def get_quarantine_end(self, command, current_time):
+        record = self.records.get(command)
+        if not record or not record.get("quarantined_until"):
+            return None
+        quarantined_until = datetime.fromisoformat(record["quarantined_until"])
+        return quarantined_until if quarantined_until > current_time else None
+
+    def record_run(self, command, error, runtime, current_time):
+        record = self.records.setdefault(
+            command,
+            {
+                "runs": 0,
+                "failures": 0,
+                "last_error": None,
+                "avg_runtime": 0.0,
+                "quarantined_until": None,
+            },
+        )
+        record["runs"] += 1
+        record["avg_runtime"] += (runtime - record["avg_runtime"]) / record["runs"]
+
+        if error is None:
+            record["failures"] = 0
+            record["quarantined_until"] = None
+            return
+
+        record["failures"] += 1
+        record["last_error"] = error
+        if record["failures"] >= QUARANTINE_FAILURE_THRESHOLD:
+            # Double the backoff for every failed retry after the threshold
+            backoff_hours = min(
+                QUARANTINE_BASE_HOURS
+                * 2 ** (record["failures"] - QUARANTINE_FAILURE_THRESHOLD),
+                QUARANTINE_MAX_HOURS,
+            )
+            quarantined_until = current_time + timedelta(hours=backoff_hours)
+            record["quarantined_until"] = quarantined_until.isoformat()
+            logging.warning(
+                f"Quarantining command after {record['failures']} consecutive "
+                f"failures until {quarantined_until:%Y-%m-%d %H:%M}: {command}"
+            )
+
+    def get_quarantined(self, current_time):
+        return {
+            command: record
+            for command, record in self.records.items()
+            if self.get_quarantine_end(command, current_time)
+        }